@@ -0,0 +1,27 @@
+import argparse
+
+from calories.entity import config_entity
+from calories.components.artifact_manager import ArtifactManager
+
+# Standalone clean up of artifact and logs folder, same step the training pipeline runs at the end
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate and garbage collect artifact and log folders")
+    parser.add_argument("--keep-last", type=int, default=5, help="Number of latest runs to keep")
+    parser.add_argument("--keep-logs", type=int, default=20, help="Number of latest log files to keep")
+    parser.add_argument("--drop-pushed", action="store_true", help="Also remove old runs that pushed a model")
+    parser.add_argument("--no-dedup", action="store_true", help="Skip hardlinking identical files")
+    args = parser.parse_args()
+    if args.keep_last < 1:
+        parser.error("--keep-last must be at least 1, the latest run may still be training")
+
+    artifact_manager_config = config_entity.ArtifactManagerConfig()
+    artifact_manager_config.keep_last_n_runs = args.keep_last
+    artifact_manager_config.keep_last_n_log_files = args.keep_logs
+    artifact_manager_config.keep_pushed_models = not args.drop_pushed
+    artifact_manager_config.deduplicate = not args.no_dedup
+
+    artifact_manager_artifact = ArtifactManager(artifact_manager_config=artifact_manager_config).initiate_artifact_manager()
+    print(f"Removed runs: {len(artifact_manager_artifact.removed_run_dirs)}")
+    print(f"Removed log files: {len(artifact_manager_artifact.removed_log_files)}")
+    print(f"Deduplicated files: {artifact_manager_artifact.deduplicated_files}, reclaimed bytes: {artifact_manager_artifact.reclaimed_bytes}")
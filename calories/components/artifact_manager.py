@@ -0,0 +1,218 @@
+import os,sys
+import shutil
+import time
+import hashlib
+import logging as std_logging
+from calories.logger import logger
+from calories.exception import CalorieException
+from calories.entity import config_entity, artifact_entity
+
+class ArtifactManager:
+    def __init__(self,artifact_manager_config:config_entity.ArtifactManagerConfig):
+        '''
+        Storing the input to a variable to use in pipeline
+        '''
+        try:
+            logger.info(f"{'>>'*20} Artifact Manager {'<<'*20}")
+            self.artifact_manager_config = artifact_manager_config
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def list_run_dirs(self)->list:
+        """
+        Returns every run folder inside artifact root, oldest first
+        """
+        try:
+            artifact_root_dir = self.artifact_manager_config.artifact_root_dir
+            if not os.path.isdir(artifact_root_dir):
+                return []
+            run_dirs = [os.path.join(artifact_root_dir,name) for name in os.listdir(artifact_root_dir)
+                        if os.path.isdir(os.path.join(artifact_root_dir,name))]
+            return sorted(run_dirs, key=config_entity.run_timestamp)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    @staticmethod
+    def has_pushed_model(run_dir:str)->bool:
+        """
+        True if model pusher stored a model inside this run
+        """
+        pusher_model_dir = os.path.join(run_dir,"model_pusher","saved_models")
+        return os.path.isdir(pusher_model_dir) and len(os.listdir(pusher_model_dir))>0
+
+    @staticmethod
+    def is_recently_modified(run_dir:str, grace_seconds:float)->bool:
+        """
+        True if the run folder or any of its step folders changed within grace_seconds
+        """
+        paths = [run_dir] + [os.path.join(run_dir,name) for name in os.listdir(run_dir)]
+        latest_mtime = max(os.path.getmtime(path) for path in paths)
+        return time.time() - latest_mtime < grace_seconds
+
+    def apply_retention_policy(self)->tuple:
+        """
+        Keeps last N runs, runs with pushed model and the current run.
+        Removes every other run folder
+        =========================================================================================
+        returns (retained run dirs, removed run dirs)
+        """
+        try:
+            run_dirs = self.list_run_dirs()
+            keep_last_n_runs = self.artifact_manager_config.keep_last_n_runs
+            current_artifact_dir = self.artifact_manager_config.current_artifact_dir
+
+            retained, removed = [], []
+            for index, run_dir in enumerate(run_dirs):
+                is_recent = index >= len(run_dirs) - keep_last_n_runs
+                is_current = current_artifact_dir is not None and os.path.abspath(run_dir)==os.path.abspath(current_artifact_dir)
+                is_pushed = self.artifact_manager_config.keep_pushed_models and ArtifactManager.has_pushed_model(run_dir)
+                # Without a current run (standalone clean up) a recently touched run may still be training
+                is_active = current_artifact_dir is None and ArtifactManager.is_recently_modified(
+                    run_dir, self.artifact_manager_config.active_run_grace_seconds)
+                if is_recent or is_current or is_pushed or is_active:
+                    retained.append(run_dir)
+                else:
+                    logger.info(f"Removing old run folder: {run_dir}")
+                    shutil.rmtree(run_dir, ignore_errors=True)
+                    removed.append(run_dir)
+            return retained, removed
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def file_hash(self,file_path:str)->str:
+        """
+        Returns sha256 of file content, read in chunks to keep memory flat
+        """
+        try:
+            sha = hashlib.sha256()
+            with open(file_path,"rb") as file_obj:
+                for chunk in iter(lambda: file_obj.read(self.artifact_manager_config.hash_chunk_size), b""):
+                    sha.update(chunk)
+            return sha.hexdigest()
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def deduplicate_files(self,run_dirs:list)->tuple:
+        """
+        Replaces files with identical content across runs by hardlinks to a single copy.
+        Files are grouped by size and inode first, so each inode is hashed at most once
+        and sizes held by a single inode are not hashed at all
+        =========================================================================================
+        returns (number of files linked, bytes reclaimed)
+        """
+        try:
+            # size -> (st_dev, st_ino) -> [paths, st_nlink]
+            inodes_by_size = dict()
+            for run_dir in run_dirs:
+                for dir_path, _, file_names in os.walk(run_dir):
+                    for file_name in file_names:
+                        file_path = os.path.join(dir_path,file_name)
+                        if os.path.islink(file_path):
+                            continue
+                        file_stat = os.stat(file_path)
+                        inodes = inodes_by_size.setdefault(file_stat.st_size,dict())
+                        inodes.setdefault((file_stat.st_dev,file_stat.st_ino),[[],file_stat.st_nlink])[0].append(file_path)
+
+            deduplicated_files, reclaimed_bytes = 0, 0
+            for size, inodes in inodes_by_size.items():
+                if size==0 or len(inodes)<2:
+                    continue
+                canonical_by_hash = dict()
+                for (device, _), (file_paths, link_count) in inodes.items():
+                    digest = (device, self.file_hash(file_paths[0]))
+                    canonical_path = canonical_by_hash.setdefault(digest,file_paths[0])
+                    if canonical_path==file_paths[0]:
+                        continue
+                    linked_paths = 0
+                    for file_path in file_paths:
+                        temp_path = file_path + ".link"
+                        try:
+                            os.link(canonical_path,temp_path)
+                            os.replace(temp_path,file_path)
+                        except OSError as e:
+                            logger.info(f"Could not hardlink {file_path}: {e}")
+                            if os.path.exists(temp_path):
+                                os.remove(temp_path)
+                            continue
+                        linked_paths += 1
+                    # Space is freed only when no other link to the old inode is left
+                    if linked_paths==link_count:
+                        reclaimed_bytes += size
+                    deduplicated_files += linked_paths
+            logger.info(f"Deduplicated files: {deduplicated_files}, reclaimed bytes: {reclaimed_bytes}")
+            return deduplicated_files, reclaimed_bytes
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    @staticmethod
+    def active_log_files()->set:
+        """
+        Log files currently opened by logging handlers
+        """
+        return {os.path.abspath(handler.baseFilename) for handler in std_logging.getLogger().handlers
+                if isinstance(handler, std_logging.FileHandler)}
+
+    def collect_old_logs(self)->list:
+        """
+        Keeps last N log files and removes the rest along with empty date folders
+        =========================================================================================
+        returns removed log files
+        """
+        try:
+            log_root_dir = self.artifact_manager_config.log_root_dir
+            if not os.path.isdir(log_root_dir):
+                return []
+            log_files = []
+            for dir_path, _, file_names in os.walk(log_root_dir):
+                for file_name in file_names:
+                    if file_name.endswith(".log"):
+                        log_files.append(os.path.join(dir_path,file_name))
+            log_files.sort(key=os.path.getmtime)
+
+            active_log_files = ArtifactManager.active_log_files()
+            keep_last_n_log_files = self.artifact_manager_config.keep_last_n_log_files
+            removed = []
+            for log_file in log_files[:max(len(log_files)-keep_last_n_log_files,0)]:
+                if os.path.abspath(log_file) in active_log_files:
+                    continue
+                os.remove(log_file)
+                removed.append(log_file)
+
+            for name in os.listdir(log_root_dir):
+                date_dir = os.path.join(log_root_dir,name)
+                if os.path.isdir(date_dir) and len(os.listdir(date_dir))==0:
+                    os.rmdir(date_dir)
+            logger.info(f"Removed {len(removed)} old log files")
+            return removed
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def initiate_artifact_manager(self)->artifact_entity.ArtifactManagerArtifact:
+        """
+        Applies retention policy on run folders, deduplicates retained runs
+        and garbage collects old logs
+        """
+        try:
+            logger.info("Applying retention policy on artifact folders")
+            retained_run_dirs, removed_run_dirs = self.apply_retention_policy()
+
+            deduplicated_files, reclaimed_bytes = 0, 0
+            if self.artifact_manager_config.deduplicate:
+                logger.info("Deduplicating identical files across retained runs")
+                deduplicated_files, reclaimed_bytes = self.deduplicate_files(run_dirs=retained_run_dirs)
+
+            logger.info("Garbage collecting old log files")
+            removed_log_files = self.collect_old_logs()
+
+            artifact_manager_artifact = artifact_entity.ArtifactManagerArtifact(
+                retained_run_dirs=retained_run_dirs,
+                removed_run_dirs=removed_run_dirs,
+                removed_log_files=removed_log_files,
+                deduplicated_files=deduplicated_files,
+                reclaimed_bytes=reclaimed_bytes)
+
+            logger.info(f"Artifact manager artifact: {artifact_manager_artifact}")
+            return artifact_manager_artifact
+
+        except Exception as e:
+            raise CalorieException(error_message=e, error_detail=sys)
@@ -4,6 +4,7 @@ import pandas as pd
 from calories import utils
 from calories.logger import logger
 from calories.exception import CalorieException
+from calories.prediction_log import get_prediction_logs_as_dataframe
 from sklearn.model_selection import train_test_split
 from calories.entity import config_entity, artifact_entity
 
@@ -30,6 +31,17 @@ class DataIngestion:
                 database_name=self.data_ingestion_config.database_name, 
                 collection_name=self.data_ingestion_config.collection_name)
 
+            if self.data_ingestion_config.include_prediction_logs:
+                logger.info("Adding served predictions with feedback from prediction logs")
+                # Adding served predictions with feedback from prediction logs
+                prediction_log_df = get_prediction_logs_as_dataframe(self.data_ingestion_config.prediction_log_config)
+                if len(prediction_log_df) > 0 and len(df.columns) > 0:
+                    df = pd.concat([df, prediction_log_df[[column for column in df.columns if column in prediction_log_df.columns]]],
+                                   ignore_index=True)
+                elif len(prediction_log_df) > 0:
+                    df = prediction_log_df
+                logger.info(f"Rows added from prediction logs: {len(prediction_log_df)}")
+
             logger.info("Save data in feature store")
             # Save data in feature store
             logger.info("Create feature store folder if not available")
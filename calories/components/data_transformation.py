@@ -11,6 +11,7 @@ from calories.entity import artifact_entity,config_entity
 from calories.exception import CalorieException
 from calories.config import TARGET_COLUMN
 
+GENDER_ENCODING = {'female':0, 'male':1}
 
 class DataTransformation:
     def __init__(self,data_transformation_config:config_entity.DataTransformationConfig,
@@ -21,7 +22,8 @@ class DataTransformation:
             self.data_validation_artifact=data_validation_artifact
         except Exception as e:
             raise CalorieException(e, sys)
-    def feature_encoding(self,df:pd.DataFrame)->Optional[pd.DataFrame]:
+    @staticmethod
+    def feature_encoding(df:pd.DataFrame)->Optional[pd.DataFrame]:
         """
         This function will replace the categorical data of each column to numerical (Array type)
 
@@ -31,7 +33,7 @@ class DataTransformation:
         """
         try:
             logging.info("Replacing 'female' to 0 and 'male' to 1 'Gender' column")
-            df['Gender'] = df['Gender'].replace({'female':0, 'male':1})
+            df['Gender'] = df['Gender'].replace(GENDER_ENCODING)
             return df
 
         except Exception as e:
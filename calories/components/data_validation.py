@@ -4,6 +4,7 @@ from scipy.stats import ks_2samp    # Compares the continuous distribution of tw
 from typing import Optional
 
 from calories import utils
+from calories import reporting
 from calories.logger import logging
 from calories.exception import CalorieException
 from calories.entity import artifact_entity,config_entity
@@ -135,9 +136,12 @@ class DataValidation:
             test_df.to_csv(path_or_buf=self.data_validation_config.test_file_path,index=False,header=True)
             
             # Write the report
-            logging.info("Writing report in yaml file")
-            utils.write_yaml_file(file_path=self.data_validation_config.report_file_path,
-            data=self.validation_error)   # valiadtion_error: drop columns, missing columns, drift report
+            logging.info("Writing report in yaml and json file and adding it to report index")
+            reporting.write_validation_report(report=self.validation_error,   # valiadtion_error: drop columns, missing columns, drift report
+            report_file_path=self.data_validation_config.report_file_path,
+            compact_report_file_path=self.data_validation_config.compact_report_file_path,
+            index_file_path=self.data_validation_config.report_index_file_path,
+            run_id=self.data_validation_config.run_id)
 
             data_validation_artifact = artifact_entity.DataValidationArtifact(report_file_path=self.data_validation_config.report_file_path, 
             train_file_path=self.data_validation_config.train_file_path, test_file_path=self.data_validation_config.test_file_path)
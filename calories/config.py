@@ -12,6 +12,36 @@ class EnvironmentVariable:
     aws_access_secret_key:str = os.getenv("AWS_SECRET_ACCESS_KEY")
 
 
+@dataclass
+class MongoPoolConfig:
+    """
+    Connection pool and retry settings shared by sync and async mongo clients
+    """
+    max_pool_size:int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+    min_pool_size:int = int(os.getenv("MONGO_MIN_POOL_SIZE", 5))
+    max_idle_time_ms:int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000))
+    wait_queue_timeout_ms:int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    server_selection_timeout_ms:int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    connect_timeout_ms:int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    max_retries:int = int(os.getenv("MONGO_MAX_RETRIES", 3))
+    backoff_base_seconds:float = float(os.getenv("MONGO_BACKOFF_BASE_SECONDS", 0.2))
+    backoff_max_seconds:float = float(os.getenv("MONGO_BACKOFF_MAX_SECONDS", 5.0))
+
+    def client_kwargs(self)->dict:
+        """
+        Keyword arguments accepted by both pymongo.MongoClient and motor AsyncIOMotorClient
+        """
+        return dict(maxPoolSize=self.max_pool_size,
+                    minPoolSize=self.min_pool_size,
+                    maxIdleTimeMS=self.max_idle_time_ms,
+                    waitQueueTimeoutMS=self.wait_queue_timeout_ms,
+                    serverSelectionTimeoutMS=self.server_selection_timeout_ms,
+                    connectTimeoutMS=self.connect_timeout_ms,
+                    retryWrites=True,
+                    retryReads=True)
+
+
 env_var = EnvironmentVariable()
-mongo_client = pymongo.MongoClient(env_var.mongo_db_url)
+mongo_pool_config = MongoPoolConfig()
+mongo_client = pymongo.MongoClient(env_var.mongo_db_url, **mongo_pool_config.client_kwargs())
 TARGET_COLUMN = "Calories"
\ No newline at end of file
@@ -0,0 +1,200 @@
+import sys
+import time
+import random
+import asyncio
+import pandas as pd
+from bson import ObjectId
+from pymongo.errors import ConnectionFailure, BulkWriteError, DuplicateKeyError
+from calories.logger import logger
+from calories.exception import CalorieException
+from calories.config import env_var, mongo_client, mongo_pool_config, MongoPoolConfig
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:     # motor is optional, async access falls back to a thread pool
+    AsyncIOMotorClient = None
+
+
+def backoff_seconds(attempt:int, pool_config:MongoPoolConfig)->float:
+    """
+    Exponential backoff with full jitter for the given retry attempt (starting from 0)
+    """
+    delay = min(pool_config.backoff_max_seconds, pool_config.backoff_base_seconds * (2 ** attempt))
+    return random.uniform(0, delay)
+
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+def is_duplicate_key_only(error:Exception)->bool:
+    """
+    True if every failed write is a duplicate key, i.e. the documents are already stored
+    """
+    if isinstance(error, DuplicateKeyError):
+        return True
+    if isinstance(error, BulkWriteError):
+        write_errors = error.details.get("writeErrors", [])
+        return (len(write_errors) > 0 and len(error.details.get("writeConcernErrors", [])) == 0
+                and all(write_error.get("code") == DUPLICATE_KEY_ERROR_CODE for write_error in write_errors))
+    return False
+
+
+def with_object_ids(records:list)->list:
+    """
+    Copies records with '_id' assigned up front, so a retried insert reuses the same ids
+    and the caller's dicts are never modified
+    """
+    return [dict(record, _id=record.get("_id", ObjectId())) for record in records]
+
+
+class MongoDataAccess:
+    """
+    Synchronous access to mongo collections with retries on connection failures.
+    client: any pymongo compatible client, defaults to the shared pooled client
+    (a local stand-in such as mongomock.MongoClient can be passed in tests)
+    """
+    def __init__(self, client=None, pool_config:MongoPoolConfig=mongo_pool_config):
+        try:
+            self.client = client if client is not None else mongo_client
+            self.pool_config = pool_config
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def with_retry(self, operation, *args, **kwargs):
+        """
+        Runs operation and retries it with backoff while mongo is unreachable.
+        A write retried after a dropped connection may find its documents already stored,
+        such duplicate key failures count as success and None is returned
+        """
+        for attempt in range(self.pool_config.max_retries + 1):
+            try:
+                return operation(*args, **kwargs)
+            except (BulkWriteError, DuplicateKeyError) as e:
+                if attempt > 0 and is_duplicate_key_only(e):
+                    logger.info("Documents were written by an earlier attempt")
+                    return None
+                raise
+            except ConnectionFailure as e:
+                if attempt == self.pool_config.max_retries:
+                    raise
+                delay = backoff_seconds(attempt, self.pool_config)
+                logger.info(f"Mongo operation failed: {e}, retrying in {delay:.2f} seconds")
+                time.sleep(delay)
+
+    def get_collection(self, database_name:str, collection_name:str):
+        return self.client[database_name][collection_name]
+
+    def get_collection_as_dataframe(self, database_name:str, collection_name:str)->pd.DataFrame:
+        """
+        Returns whole collection as dataframe without '_id' column
+        """
+        try:
+            collection = self.get_collection(database_name, collection_name)
+            records = self.with_retry(lambda: list(collection.find({}, {"_id": 0})))
+            return pd.DataFrame(records)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def insert_many(self, database_name:str, collection_name:str, records:list)->int:
+        """
+        Inserts records without stopping at the first failed document, returns inserted count
+        """
+        try:
+            if len(records) == 0:
+                return 0
+            collection = self.get_collection(database_name, collection_name)
+            documents = with_object_ids(records)
+            result = self.with_retry(collection.insert_many, documents, ordered=False)
+            return len(documents) if result is None else len(result.inserted_ids)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def find_one(self, database_name:str, collection_name:str, query:dict)->dict:
+        try:
+            collection = self.get_collection(database_name, collection_name)
+            return self.with_retry(collection.find_one, query, {"_id": 0})
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+
+class AsyncMongoDataAccess:
+    """
+    asyncio access to mongo collections for the inference service.
+    Uses motor when installed, otherwise runs a pymongo compatible client
+    (or a local stand-in) in the default thread pool so the event loop is never blocked
+    """
+    def __init__(self, client=None, pool_config:MongoPoolConfig=mongo_pool_config):
+        try:
+            self.pool_config = pool_config
+            if client is None:
+                client = (AsyncIOMotorClient(env_var.mongo_db_url, **pool_config.client_kwargs())
+                          if AsyncIOMotorClient is not None else mongo_client)
+            self.client = client
+            self.is_motor = AsyncIOMotorClient is not None and isinstance(client, AsyncIOMotorClient)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    async def call(self, operation, *args, **kwargs):
+        """
+        Awaits a motor coroutine or runs a blocking call in a worker thread
+        """
+        if self.is_motor:
+            return await operation(*args, **kwargs)
+        return await asyncio.to_thread(operation, *args, **kwargs)
+
+    async def with_retry(self, operation, *args, **kwargs):
+        """
+        Same retry rules as MongoDataAccess.with_retry
+        """
+        for attempt in range(self.pool_config.max_retries + 1):
+            try:
+                return await self.call(operation, *args, **kwargs)
+            except (BulkWriteError, DuplicateKeyError) as e:
+                if attempt > 0 and is_duplicate_key_only(e):
+                    logger.info("Documents were written by an earlier attempt")
+                    return None
+                raise
+            except ConnectionFailure as e:
+                if attempt == self.pool_config.max_retries:
+                    raise
+                delay = backoff_seconds(attempt, self.pool_config)
+                logger.info(f"Async mongo operation failed: {e}, retrying in {delay:.2f} seconds")
+                await asyncio.sleep(delay)
+
+    def get_collection(self, database_name:str, collection_name:str):
+        return self.client[database_name][collection_name]
+
+    async def insert_one(self, database_name:str, collection_name:str, record:dict):
+        try:
+            collection = self.get_collection(database_name, collection_name)
+            document = with_object_ids([record])[0]
+            result = await self.with_retry(collection.insert_one, document)
+            return document["_id"] if result is None else result.inserted_id
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    async def insert_many(self, database_name:str, collection_name:str, records:list)->int:
+        try:
+            if len(records) == 0:
+                return 0
+            collection = self.get_collection(database_name, collection_name)
+            documents = with_object_ids(records)
+            result = await self.with_retry(collection.insert_many, documents, ordered=False)
+            return len(documents) if result is None else len(result.inserted_ids)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    async def find_one(self, database_name:str, collection_name:str, query:dict)->dict:
+        try:
+            collection = self.get_collection(database_name, collection_name)
+            return await self.with_retry(collection.find_one, query, {"_id": 0})
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    async def find(self, database_name:str, collection_name:str, query:dict, limit:int=0)->list:
+        try:
+            collection = self.get_collection(database_name, collection_name)
+            if self.is_motor:
+                return await self.with_retry(lambda: collection.find(query, {"_id": 0}).to_list(length=limit or None))
+            return await self.with_retry(lambda: list(collection.find(query, {"_id": 0}).limit(limit)))
+        except Exception as e:
+            raise CalorieException(e, sys)
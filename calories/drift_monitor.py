@@ -0,0 +1,199 @@
+import sys
+import time
+import threading
+import numpy as np
+import pandas as pd
+from bisect import bisect_right
+from datetime import datetime
+from scipy.stats import kstwo    # Distribution of two sample KS statistic, same as ks_2samp asymptotic p-value
+from calories import utils
+from calories.logger import logger
+from calories.exception import CalorieException
+from calories.config import TARGET_COLUMN
+from calories.entity.config_entity import DriftMonitorConfig
+from calories.components.data_transformation import DataTransformation, GENDER_ENCODING
+
+
+def log_drift_alert(drifted_columns:dict):
+    logger.info(f"Data drift detected on live traffic: {drifted_columns}")
+
+
+class DriftMonitor:
+    """
+    Compares live inference traffic with base data using fixed memory per feature histograms.
+    Histograms share bin edges with base data and are kept for a sliding window split in buckets,
+    a background thread runs the KS test between window and base histograms every check interval.
+    Records passed in must already be encoded like training input ('Gender' as 0/1)
+    """
+    def __init__(self, drift_monitor_config:DriftMonitorConfig=None, alert_callback=log_drift_alert, start_thread:bool=True):
+        try:
+            logger.info(f"{'>>'*20} Drift Monitor {'<<'*20}")
+            self.drift_monitor_config = drift_monitor_config if drift_monitor_config is not None else DriftMonitorConfig()
+            self.alert_callback = alert_callback
+            self.bucket_seconds = self.drift_monitor_config.window_seconds / self.drift_monitor_config.n_buckets
+            self.lock = threading.Lock()
+            self.stop_event = threading.Event()
+            self.latest_report = dict()
+
+            self.load_base_histograms()
+            n_buckets = self.drift_monitor_config.n_buckets
+            self.bucket_counts = [self.empty_counts() for _ in range(n_buckets)]
+            self.bucket_sizes = [0]*n_buckets
+            self.current_epoch = int(time.monotonic() / self.bucket_seconds)
+            self.bucket_end = (self.current_epoch + 1) * self.bucket_seconds
+            self.current_counts = self.bucket_counts[self.current_epoch % n_buckets]
+
+            self.thread = None
+            if start_thread:
+                self.thread = threading.Thread(target=self.run, name="drift-monitor", daemon=True)
+                self.thread.start()
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def load_base_histograms(self):
+        """
+        Reads base file once and keeps only bin edges and bin counts per feature
+        """
+        try:
+            base_df = pd.read_csv(self.drift_monitor_config.base_file_path)
+            base_df = base_df.drop(columns=["User_ID", TARGET_COLUMN], errors="ignore")
+            base_df = utils.convert_columns_float(DataTransformation.feature_encoding(base_df))
+
+            quantiles = np.linspace(0, 1, self.drift_monitor_config.n_bins + 1)
+            self.feature_columns = list(base_df.columns)
+            self.feature_edges = []
+            self.base_counts = []
+            for column in self.feature_columns:
+                unique_values = np.unique(base_df[column])
+                if len(unique_values) <= self.drift_monitor_config.n_bins:
+                    # Low cardinality (e.g. 'Gender'): midpoints give every base value its own bin
+                    edges = (unique_values[:-1] + unique_values[1:]) / 2
+                else:
+                    # Interior edges only, values outside base range fall in the first or last bin
+                    edges = np.unique(np.quantile(base_df[column], quantiles))[1:-1]
+                self.feature_edges.append(edges.tolist())
+                self.base_counts.append(np.bincount(np.searchsorted(edges, base_df[column], side="right"),
+                                                    minlength=len(edges)+1))
+            self.base_size = len(base_df)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def empty_counts(self)->list:
+        return [[0]*(len(edges)+1) for edges in self.feature_edges]
+
+    def rotate(self, now:float):
+        """
+        Moves to the bucket of current time and clears buckets that left the window
+        """
+        n_buckets = self.drift_monitor_config.n_buckets
+        epoch = int(now / self.bucket_seconds)
+        for skipped_epoch in range(max(self.current_epoch + 1, epoch - n_buckets + 1), epoch + 1):
+            index = skipped_epoch % n_buckets
+            self.bucket_counts[index] = self.empty_counts()
+            self.bucket_sizes[index] = 0
+        self.current_epoch = epoch
+        self.bucket_end = (epoch + 1) * self.bucket_seconds
+        self.current_counts = self.bucket_counts[epoch % n_buckets]
+
+    def update(self, record:dict):
+        """
+        Adds one request to the current bucket, a bisect and an increment per feature
+        """
+        self.update_rows([[record[column] for column in self.feature_columns]])
+
+    def update_rows(self, rows:list):
+        """
+        Adds rows of feature values (in feature_columns order) with one bisect and increment per value
+        """
+        now = time.monotonic()
+        with self.lock:
+            if now >= self.bucket_end:
+                self.rotate(now)
+            for row in rows:
+                for counts, edges, value in zip(self.current_counts, self.feature_edges, row):
+                    counts[bisect_right(edges, value)] += 1
+            self.bucket_sizes[self.current_epoch % self.drift_monitor_config.n_buckets] += len(rows)
+
+    def update_records(self, records:list):
+        """
+        Adds raw input records as served ('Gender' as text), no pandas or numpy call per request
+        """
+        rows = [[record[column] for column in self.feature_columns] for record in records]
+        if "Gender" in self.feature_columns:
+            gender_index = self.feature_columns.index("Gender")
+            for row in rows:
+                row[gender_index] = GENDER_ENCODING.get(row[gender_index], row[gender_index])
+        self.update_rows(rows)
+
+    def update_frame(self, df:pd.DataFrame):
+        """
+        Adds a batch of requests at once using vectorized binning, only worth its fixed
+        per column numpy cost for large batches (see update_records for serving requests)
+        """
+        try:
+            binned = [np.bincount(np.searchsorted(edges, df[column].to_numpy(dtype=float), side="right"),
+                                  minlength=len(edges)+1)
+                      for column, edges in zip(self.feature_columns, self.feature_edges)]
+            now = time.monotonic()
+            with self.lock:
+                if now >= self.bucket_end:
+                    self.rotate(now)
+                for counts, batch_counts in zip(self.current_counts, binned):
+                    for index in np.flatnonzero(batch_counts):
+                        counts[index] += int(batch_counts[index])
+                self.bucket_sizes[self.current_epoch % self.drift_monitor_config.n_buckets] += len(df)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def check_drift(self)->dict:
+        """
+        Runs KS test for every feature between sliding window and base histograms
+        =========================================================================================
+        returns drift report in the same format as data validation report
+        """
+        try:
+            with self.lock:
+                self.rotate(time.monotonic())
+                window_counts = [np.sum([bucket[i] for bucket in self.bucket_counts], axis=0)
+                                 for i in range(len(self.feature_columns))]
+                window_size = int(sum(self.bucket_sizes))
+
+            drift_report = {"checked_at": datetime.now().isoformat(), "window_size": window_size}
+            if window_size < self.drift_monitor_config.min_window_size:
+                logger.info(f"Skipping drift check, window has only {window_size} requests")
+                return drift_report
+
+            effective_size = round(window_size * self.base_size / (window_size + self.base_size))
+            drifted_columns = dict()
+            for column, base_counts, current_counts in zip(self.feature_columns, self.base_counts, window_counts):
+                base_cdf = np.cumsum(base_counts) / self.base_size
+                current_cdf = np.cumsum(current_counts) / window_size
+                ks_statistic = float(np.max(np.abs(base_cdf - current_cdf)))
+                pvalue = float(kstwo.sf(ks_statistic, effective_size))
+                drift_report[column] = {
+                    "ks_statistic": ks_statistic,
+                    "pvalues": pvalue,
+                    "same_distribution": pvalue > self.drift_monitor_config.pvalue_threshold
+                }
+                if pvalue <= self.drift_monitor_config.pvalue_threshold:
+                    drifted_columns[column] = drift_report[column]
+
+            self.latest_report = drift_report
+            utils.write_yaml_file(file_path=self.drift_monitor_config.report_file_path, data=drift_report)
+            if len(drifted_columns) > 0:
+                self.alert_callback(drifted_columns)
+            return drift_report
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def run(self):
+        while not self.stop_event.wait(timeout=self.drift_monitor_config.check_interval_seconds):
+            try:
+                self.check_drift()
+            except Exception as e:
+                logger.info(f"Drift check failed: {e}")
+
+    def close(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
@@ -32,4 +32,12 @@ class ModelEvaluationArtifact:
 @dataclass
 class ModelPusherArtifact:
     pusher_model_dir:str 
-    saved_model_dir:str
\ No newline at end of file
+    saved_model_dir:str
+
+@dataclass
+class ArtifactManagerArtifact:
+    retained_run_dirs:list
+    removed_run_dirs:list
+    removed_log_files:list
+    deduplicated_files:int
+    reclaimed_bytes:int
@@ -8,12 +8,30 @@ TRAIN_FILE_NAME = "train.csv"
 TEST_FILE_NAME = "test.csv"
 TRANSFORMER_OBJECT_FILE_NAME = "transformer.pkl"
 MODEL_FILE_NAME = "model.pkl"
+PREDICTION_LOG_DIR_NAME = "prediction_logs"
+
+ARTIFACT_DIR_NAME = "artifact"
+LOG_DIR_NAME = "logs"
+# Name of each run folder inside artifact dir, also parsed back to order runs by time
+RUN_DIR_FORMAT = '%m%d%Y__%H%M%S'
+
+
+def run_timestamp(run_dir:str)->datetime:
+    """
+    Returns the creation time of a run from its folder name, falling back to
+    the folder modification time for folders not created by the pipeline
+    """
+    try:
+        return datetime.strptime(os.path.basename(run_dir), RUN_DIR_FORMAT)
+    except ValueError:
+        return datetime.fromtimestamp(os.path.getmtime(run_dir))
+
 
 class TrainingPipelineConfig:
 
     def __init__(self):
         try:
-            self.artifact_dir = os.path.join(os.getcwd(),"artifact",f"{datetime.now().strftime('%m%d%Y__%H%M%S')}")
+            self.artifact_dir = os.path.join(os.getcwd(),ARTIFACT_DIR_NAME,f"{datetime.now().strftime(RUN_DIR_FORMAT)}")
         except Exception  as e:
             raise CalorieException(e,sys)     
 
@@ -29,6 +47,9 @@ class DataIngestionConfig:
             self.train_file_path = os.path.join(self.data_ingestion_dir,"dataset",TRAIN_FILE_NAME)
             self.test_file_path = os.path.join(self.data_ingestion_dir,"dataset",TEST_FILE_NAME)
             self.test_size = 0.2
+            # Served predictions with feedback are added to the collection data only when enabled
+            self.include_prediction_logs = os.getenv("INCLUDE_PREDICTION_LOGS","false").lower() == "true"
+            self.prediction_log_config = PredictionLogConfig()
         except Exception  as e:
             raise CalorieException(e,sys)        
 
@@ -48,6 +69,10 @@ class DataValidationConfig:
     def __init__(self,training_pipeline_config:TrainingPipelineConfig):
         self.data_validation_dir = os.path.join(training_pipeline_config.artifact_dir , "data_validation")
         self.report_file_path=os.path.join(self.data_validation_dir, "report.yaml")
+        self.compact_report_file_path=os.path.join(self.data_validation_dir, "report.json")
+        # One line per run, shared by all runs so history can be read without opening every report
+        self.report_index_file_path=os.path.join(os.path.dirname(training_pipeline_config.artifact_dir), "report_index.jsonl")
+        self.run_id = os.path.basename(training_pipeline_config.artifact_dir)
         self.train_file_path = os.path.join(self.data_validation_dir,"dataset",TRAIN_FILE_NAME)
         self.test_file_path = os.path.join(self.data_validation_dir,"dataset",TEST_FILE_NAME)
         self.base_file_path = os.path.join("CaloriesBurn.csv")
@@ -81,4 +106,53 @@ class ModelPusherConfig:
         self.pusher_model_dir = os.path.join(self.model_pusher_dir,"saved_models")
         self.pusher_model_path = os.path.join(self.pusher_model_dir,MODEL_FILE_NAME)
         self.pusher_transformer_path = os.path.join(self.pusher_model_dir,TRANSFORMER_OBJECT_FILE_NAME)
-        # self.pusher_target_encoder_path = os.path.join(self.pusher_model_dir,TARGET_ENCODER_OBJECT_FILE_NAME)
\ No newline at end of file
+        # self.pusher_target_encoder_path = os.path.join(self.pusher_model_dir,TARGET_ENCODER_OBJECT_FILE_NAME)
+
+class ArtifactManagerConfig:
+    def __init__(self,training_pipeline_config:TrainingPipelineConfig=None):
+        # Root folders holding every run, independent of the current run
+        self.artifact_root_dir = os.path.join(os.getcwd(),ARTIFACT_DIR_NAME)
+        self.log_root_dir = os.path.join(os.getcwd(),LOG_DIR_NAME)
+        # Run currently in progress is never removed
+        self.current_artifact_dir = training_pipeline_config.artifact_dir if training_pipeline_config else None
+        self.keep_last_n_runs = 5
+        # Standalone clean up never removes runs touched within this many seconds
+        self.active_run_grace_seconds = 30*60
+        self.keep_pushed_models = True
+        self.keep_last_n_log_files = 20
+        self.deduplicate = True
+        self.hash_chunk_size = 1024*1024
+
+
+class PredictionLogConfig:
+    def __init__(self):
+        # "jsonl" or "parquet" write part files under log_dir, "mongo" writes to the collections below.
+        # parquet needs pyarrow or fastparquet installed
+        self.backend = os.getenv("PREDICTION_LOG_BACKEND","jsonl")
+        self.database_name = "calories_burn"
+        self.prediction_collection_name = "prediction_logs"
+        self.feedback_collection_name = "prediction_feedback"
+        self.log_dir = os.path.join(os.getcwd(),PREDICTION_LOG_DIR_NAME)
+        self.prediction_dir = os.path.join(self.log_dir,"predictions")
+        self.feedback_dir = os.path.join(self.log_dir,"feedback")
+        # Records kept in memory before the oldest ones are dropped
+        self.buffer_capacity = 10000
+        self.batch_size = 500
+        self.flush_interval_seconds = 5.0
+
+
+class DriftMonitorConfig:
+    def __init__(self):
+        self.base_file_path = os.path.join("CaloriesBurn.csv")
+        self.drift_monitor_dir = os.path.join(os.getcwd(),"drift_monitor")
+        self.report_file_path = os.path.join(self.drift_monitor_dir,"report.yaml")
+        # Bin edges are quantiles of base data, so every bin holds a similar share of base rows
+        self.n_bins = 50
+        # Sliding window made of n_buckets sub windows, oldest bucket is discarded as a whole
+        self.window_seconds = 900
+        self.n_buckets = 15
+        self.check_interval_seconds = 60.0
+        # Requests up to this many rows are binned row by row with bisect, larger batches with numpy
+        self.small_frame_rows = 64
+        self.min_window_size = 200
+        self.pvalue_threshold = 0.05
@@ -1 +1,76 @@
-# prediction_pipeline_py_content
\ No newline at end of file
+import os,sys
+import uuid
+import pandas as pd
+from datetime import datetime
+
+from calories import utils
+from calories.logger import logging
+from calories.exception import CalorieException
+from calories.entity.config_entity import MODEL_FILE_NAME, TRANSFORMER_OBJECT_FILE_NAME, PredictionLogConfig, DriftMonitorConfig
+from calories.components.data_transformation import DataTransformation
+from calories.prediction_log import create_prediction_log_sinks
+from calories.drift_monitor import DriftMonitor
+
+
+class PredictionPipeline:
+    def __init__(self, saved_model_dir:str=os.path.join("saved_models"),
+                    prediction_log_config:PredictionLogConfig=None,
+                    drift_monitor_config:DriftMonitorConfig=None):
+        '''
+        Loading pushed model and transformer, every served prediction is logged through prediction log sink
+        and its input is tracked by drift monitor
+        '''
+        try:
+            logging.info(f"{'>>'*20} Prediction Pipeline {'<<'*20}")
+            self.model = utils.load_object(file_path=os.path.join(saved_model_dir, MODEL_FILE_NAME))
+            self.transformer = utils.load_object(file_path=os.path.join(saved_model_dir, TRANSFORMER_OBJECT_FILE_NAME))
+            self.feature_columns = list(self.transformer.feature_names_in_)
+            self.prediction_log_config = prediction_log_config if prediction_log_config is not None else PredictionLogConfig()
+            self.prediction_log_sink, self.feedback_log_sink = create_prediction_log_sinks(self.prediction_log_config)
+            self.drift_monitor = DriftMonitor(drift_monitor_config=drift_monitor_config)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def predict(self, input_df:pd.DataFrame)->pd.DataFrame:
+        """
+        input_df : raw input with the same columns as training data (without 'Calories')
+        =========================================================================================
+        returns Pandas Dataframe with 'request_id' and 'Predicted_Calories' for each input row,
+        request_id is used to send the actual calories back through record_feedback
+        """
+        try:
+            feature_df = DataTransformation.feature_encoding(input_df[self.feature_columns].copy())
+            feature_df = utils.convert_columns_float(df=feature_df)
+            predictions = self.model.predict(self.transformer.transform(feature_df))
+
+            records = input_df.to_dict(orient="records")
+            if len(records) <= self.drift_monitor.drift_monitor_config.small_frame_rows:
+                self.drift_monitor.update_records(records)
+            else:
+                self.drift_monitor.update_frame(feature_df)
+
+            logged_at = datetime.now().isoformat()
+            request_ids = [uuid.uuid4().hex for _ in range(len(input_df))]
+            for request_id, record, prediction in zip(request_ids, records, predictions):
+                record.update(request_id=request_id, logged_at=logged_at, Predicted_Calories=float(prediction))
+                self.prediction_log_sink.log(record)
+
+            return pd.DataFrame({"request_id": request_ids, "Predicted_Calories": predictions})
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def record_feedback(self, request_id:str, calories:float):
+        """
+        Stores actual calories burnt for a served prediction, used as target in next training run
+        """
+        try:
+            self.feedback_log_sink.log({"request_id": request_id,
+                                        "logged_at": datetime.now().isoformat(),
+                                        "Calories": float(calories)})
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def close(self):
+        self.prediction_log_sink.close()
+        self.feedback_log_sink.close()
+        self.drift_monitor.close()
@@ -15,6 +15,7 @@ from calories.components.model_pusher import ModelPusher
 from calories.components.data_transformation import DataTransformation
 from calories.components.model_trainer import ModelTrainer
 from calories.components.model_evaluation import ModelEvaluation
+from calories.components.artifact_manager import ArtifactManager
 
 
 
@@ -64,5 +65,10 @@ def start_training_pipeline():
 
         model_pusher_artifact = model_pusher.initiate_model_pusher()
 
+        # Artifact manager
+        artifact_manager_config = config_entity.ArtifactManagerConfig(training_pipeline_config=training_pipeline_config)
+        artifact_manager = ArtifactManager(artifact_manager_config=artifact_manager_config)
+        artifact_manager_artifact = artifact_manager.initiate_artifact_manager()
+
     except Exception as e:
         raise ThyroidException(error_message=e, error_detail=sys)
\ No newline at end of file
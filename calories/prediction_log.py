@@ -0,0 +1,214 @@
+import os,sys
+import atexit
+import importlib.util
+import threading
+import pandas as pd
+from collections import deque
+from datetime import datetime
+from calories import utils
+from calories.logger import logger
+from calories.exception import CalorieException
+from calories.data_access import MongoDataAccess
+from calories.entity.config_entity import PredictionLogConfig
+
+
+class MongoLogWriter:
+    """
+    Writes a batch of records to a mongo collection in one bulk insert
+    """
+    def __init__(self, database_name:str, collection_name:str, data_access:MongoDataAccess=None):
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.data_access = data_access if data_access is not None else MongoDataAccess()
+
+    def write(self, records:list):
+        self.data_access.insert_many(self.database_name, self.collection_name, records)
+
+
+class PartFileLogWriter:
+    """
+    Writes every batch as a new part file inside log_dir
+    """
+    extension = None
+
+    def __init__(self, log_dir:str):
+        self.log_dir = log_dir
+        self.part_number = 0
+
+    def next_file_path(self)->str:
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.part_number += 1
+        file_name = f"part-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}-{self.part_number:05d}.{self.extension}"
+        return os.path.join(self.log_dir, file_name)
+
+
+class JsonlLogWriter(PartFileLogWriter):
+    """
+    One json record per line, needs no extra package
+    """
+    extension = "jsonl"
+
+    def write(self, records:list):
+        with open(self.next_file_path(), "wb") as file_writer:
+            file_writer.write(b"\n".join(utils.dump_json(record) for record in records) + b"\n")
+
+
+class ParquetLogWriter(PartFileLogWriter):
+    extension = "parquet"
+
+    def __init__(self, log_dir:str):
+        if importlib.util.find_spec("pyarrow") is None and importlib.util.find_spec("fastparquet") is None:
+            raise Exception("parquet prediction log backend needs pyarrow or fastparquet installed")
+        super().__init__(log_dir)
+
+    def write(self, records:list):
+        pd.DataFrame(records).to_parquet(self.next_file_path(), index=False)
+
+
+class PredictionLogSink:
+    """
+    Buffers records in a bounded ring buffer and flushes them in bulk on a background thread,
+    either when batch_size records are waiting or every flush_interval_seconds.
+    When the buffer is full the oldest record is overwritten and counted in dropped_records
+    """
+    def __init__(self, writer, buffer_capacity:int=10000, batch_size:int=500, flush_interval_seconds:float=5.0):
+        try:
+            self.writer = writer
+            self.batch_size = batch_size
+            self.flush_interval_seconds = flush_interval_seconds
+            self.buffer = deque(maxlen=buffer_capacity)
+            self.lock = threading.Lock()
+            self.flush_event = threading.Event()
+            self.stop_event = threading.Event()
+            self.dropped_records = 0
+            self.failed_records = 0
+            self.written_records = 0
+            self.thread = threading.Thread(target=self.run, name="prediction-log-sink", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def log(self, record:dict):
+        """
+        Called on the request path, only appends to the buffer
+        """
+        with self.lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped_records += 1
+            self.buffer.append(record)
+            is_batch_ready = len(self.buffer) >= self.batch_size
+        if is_batch_ready:
+            self.flush_event.set()
+
+    def flush(self):
+        """
+        Writes everything currently buffered, write errors are logged and counted, never raised
+        """
+        with self.lock:
+            if len(self.buffer) == 0:
+                return
+            records, self.buffer = list(self.buffer), deque(maxlen=self.buffer.maxlen)
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start+self.batch_size]
+            try:
+                self.writer.write(batch)
+                self.written_records += len(batch)
+            except Exception as e:
+                self.failed_records += len(batch)
+                logger.info(f"Failed to write {len(batch)} prediction log records: {e}")
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.flush_event.wait(timeout=self.flush_interval_seconds)
+            self.flush_event.clear()
+            self.flush()
+
+    def close(self):
+        """
+        Stops the background thread and writes remaining records
+        """
+        if self.stop_event.is_set():
+            return
+        self.stop_event.set()
+        self.flush_event.set()
+        self.thread.join()
+        self.flush()
+        logger.info(f"Prediction log sink closed, written: {self.written_records}, "
+                    f"dropped: {self.dropped_records}, failed: {self.failed_records}")
+
+
+def create_prediction_log_sinks(prediction_log_config:PredictionLogConfig)->tuple:
+    """
+    Returns (prediction sink, feedback sink) for the configured backend
+    """
+    try:
+        if prediction_log_config.backend == "mongo":
+            prediction_writer = MongoLogWriter(prediction_log_config.database_name, prediction_log_config.prediction_collection_name)
+            feedback_writer = MongoLogWriter(prediction_log_config.database_name, prediction_log_config.feedback_collection_name)
+        elif prediction_log_config.backend == "jsonl":
+            prediction_writer = JsonlLogWriter(prediction_log_config.prediction_dir)
+            feedback_writer = JsonlLogWriter(prediction_log_config.feedback_dir)
+        elif prediction_log_config.backend == "parquet":
+            prediction_writer = ParquetLogWriter(prediction_log_config.prediction_dir)
+            feedback_writer = ParquetLogWriter(prediction_log_config.feedback_dir)
+        else:
+            raise Exception(f"Unknown prediction log backend: {prediction_log_config.backend}")
+
+        sink_kwargs = dict(buffer_capacity=prediction_log_config.buffer_capacity,
+                           batch_size=prediction_log_config.batch_size,
+                           flush_interval_seconds=prediction_log_config.flush_interval_seconds)
+        return PredictionLogSink(prediction_writer, **sink_kwargs), PredictionLogSink(feedback_writer, **sink_kwargs)
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+
+def read_part_files(dir_path:str)->pd.DataFrame:
+    """
+    Reads every jsonl and parquet part file of a log dir, so history survives a backend switch
+    """
+    if not os.path.isdir(dir_path):
+        return pd.DataFrame()
+    dfs = []
+    for name in sorted(os.listdir(dir_path)):
+        file_path = os.path.join(dir_path, name)
+        if name.endswith(".jsonl"):
+            dfs.append(pd.read_json(file_path, lines=True, dtype=False))
+        elif name.endswith(".parquet"):
+            dfs.append(pd.read_parquet(file_path))
+    if len(dfs) == 0:
+        return pd.DataFrame()
+    return pd.concat(dfs, ignore_index=True)
+
+
+def get_prediction_logs_as_dataframe(prediction_log_config:PredictionLogConfig)->pd.DataFrame:
+    """
+    Description: Joins logged predictions with their feedback into training rows
+    =========================================================
+    Params:
+    prediction_log_config: location of logged predictions and feedback
+    =========================================================
+    return Pandas dataframe with the served input features and the actual 'Calories',
+    predictions without feedback are left out
+    """
+    try:
+        if prediction_log_config.backend == "mongo":
+            data_access = MongoDataAccess()
+            prediction_df = data_access.get_collection_as_dataframe(prediction_log_config.database_name, prediction_log_config.prediction_collection_name)
+            feedback_df = data_access.get_collection_as_dataframe(prediction_log_config.database_name, prediction_log_config.feedback_collection_name)
+        else:
+            prediction_df = read_part_files(prediction_log_config.prediction_dir)
+            feedback_df = read_part_files(prediction_log_config.feedback_dir)
+
+        if len(prediction_df) == 0 or len(feedback_df) == 0:
+            return pd.DataFrame()
+
+        # Latest feedback wins when a request was corrected more than once
+        feedback_df = feedback_df.sort_values("logged_at").drop_duplicates("request_id", keep="last")
+        df = prediction_df.drop(columns=["logged_at","Predicted_Calories"], errors="ignore").merge(
+            feedback_df[["request_id","Calories"]], on="request_id", how="inner")
+        df = df.drop(columns=["request_id"])
+        logger.info(f"Row and columns in prediction logs df: {df.shape}")
+        return df
+    except Exception as e:
+        raise CalorieException(e, sys)
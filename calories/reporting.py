@@ -0,0 +1,116 @@
+import os,sys
+import pandas as pd
+from datetime import datetime
+from calories import utils
+from calories.logger import logger
+from calories.exception import CalorieException
+from calories.entity.config_entity import run_timestamp
+
+DRIFT_REPORT_PREFIX = "data_drift_within_"
+MISSING_COLUMNS_PREFIX = "missing_columns_within_"
+
+
+def summarize_validation_report(run_id:str, report:dict)->dict:
+    """
+    Description: Reduces a validation report to one index entry
+    =========================================================
+    Params:
+    run_id: artifact folder name of the run
+    report: validation report written by data validation
+    =========================================================
+    return dict with missing columns, p-value of every column and drifted columns per dataset
+    """
+    try:
+        summary = {"run_id": run_id, "indexed_at": datetime.now().isoformat(),
+                   "missing_columns": dict(), "pvalues": dict(), "drifted_columns": dict()}
+        for key, value in report.items():
+            if key.startswith(MISSING_COLUMNS_PREFIX):
+                summary["missing_columns"][key[len(MISSING_COLUMNS_PREFIX):]] = value
+            elif key.startswith(DRIFT_REPORT_PREFIX):
+                dataset = key[len(DRIFT_REPORT_PREFIX):]
+                summary["pvalues"][dataset] = {column: column_report["pvalues"] for column, column_report in value.items()}
+                summary["drifted_columns"][dataset] = [column for column, column_report in value.items()
+                                                       if not column_report["same_distribution"]]
+        return summary
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+
+def append_to_report_index(index_file_path:str, summary:dict):
+    """
+    Appends one json line to report index
+    """
+    try:
+        os.makedirs(os.path.dirname(index_file_path), exist_ok=True)
+        with open(index_file_path, "ab") as index_writer:
+            index_writer.write(utils.dump_json(summary) + b"\n")
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+
+def write_validation_report(report:dict, report_file_path:str, compact_report_file_path:str,
+                            index_file_path:str, run_id:str):
+    """
+    Writes human readable yaml report, compact json report and adds the run to report index
+    """
+    try:
+        logger.info(f"Writing validation report: {report_file_path} and {compact_report_file_path}")
+        utils.write_yaml_file(file_path=report_file_path, data=report)
+        utils.write_json_file(file_path=compact_report_file_path, data=report)
+        append_to_report_index(index_file_path=index_file_path, summary=summarize_validation_report(run_id, report))
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+
+def load_report_index(index_file_path:str)->pd.DataFrame:
+    """
+    Description: Reads report index for dashboards
+    =========================================================
+    return Pandas dataframe with one row per run, nested values flattened
+    into columns like 'pvalues.train_dataset.Age'. Latest entry wins for a re-indexed run
+    """
+    try:
+        if not os.path.exists(index_file_path):
+            return pd.DataFrame()
+        with open(index_file_path, "rb") as index_reader:
+            summaries = [utils.load_json(line) for line in index_reader if line.strip()]
+        df = pd.json_normalize(summaries)
+        if len(df) > 0:
+            df = df.drop_duplicates("run_id", keep="last").reset_index(drop=True)
+        return df
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+
+def rebuild_report_index(artifact_root_dir:str, index_file_path:str)->int:
+    """
+    Recreates report index from every run folder, preferring compact json report over yaml.
+    Returns number of indexed runs
+    """
+    try:
+        summaries = []
+        # Folder names are RUN_DIR_FORMAT (month first), so order by parsed run time rather than by name
+        run_dirs = [os.path.join(artifact_root_dir, name) for name in os.listdir(artifact_root_dir)
+                    if os.path.isdir(os.path.join(artifact_root_dir, name))]
+        for run_dir in sorted(run_dirs, key=run_timestamp):
+            run_id = os.path.basename(run_dir)
+            data_validation_dir = os.path.join(run_dir, "data_validation")
+            compact_report_file_path = os.path.join(data_validation_dir, "report.json")
+            report_file_path = os.path.join(data_validation_dir, "report.yaml")
+            if os.path.exists(compact_report_file_path):
+                report = utils.read_json_file(compact_report_file_path)
+            elif os.path.exists(report_file_path):
+                report = utils.read_yaml_file(report_file_path)
+            else:
+                continue
+            summaries.append(summarize_validation_report(run_id, report))
+
+        temp_file_path = index_file_path + ".tmp"
+        with open(temp_file_path, "wb") as index_writer:
+            for summary in summaries:
+                index_writer.write(utils.dump_json(summary) + b"\n")
+        os.replace(temp_file_path, index_file_path)
+        logger.info(f"Report index rebuilt with {len(summaries)} runs")
+        return len(summaries)
+    except Exception as e:
+        raise CalorieException(e, sys)
@@ -0,0 +1,317 @@
+import os,sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from calories.logger import logger
+from calories.exception import CalorieException
+from calories.config import TARGET_COLUMN
+from calories.data_access import MongoDataAccess
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:     # pyarrow is only needed for parquet output
+    pa = None
+
+GENDER_COLUMN = "Gender"
+USER_ID_COLUMN = "User_ID"
+# Calories is modelled from these features, interactions with Duration carry most of the signal
+CALORIES_TERMS = ["Duration", "Heart_Rate", "Body_Temp", "Age", "Weight", "Height"]
+
+
+def format_number_column(values:np.ndarray, decimals:int)->np.ndarray:
+    """
+    Formats non negative numbers as right aligned ascii digits, one row per value.
+    Leading padding is 0 bytes, removed when the chunk is joined
+    """
+    scaled = np.round(values * 10**decimals).astype(np.int64)
+    n_digits = max(len(str(int(scaled.max()))) if len(scaled) else 1, decimals + 1)
+    text = np.empty((len(scaled), n_digits), dtype=np.uint8)
+    rest = scaled.copy()
+    for position in range(n_digits - 1, -1, -1):
+        text[:, position] = rest % 10
+        rest //= 10
+    text += ord("0")
+    # Digits of each value, at least the units digit and decimals are always written
+    value_digits = np.maximum(np.searchsorted(10 ** np.arange(1, n_digits, dtype=np.int64), scaled, side="right") + 1,
+                              decimals + 1)
+    text[np.arange(n_digits) < (n_digits - value_digits)[:, None]] = 0
+    if decimals > 0:
+        text = np.hstack([text[:, :-decimals], np.full((len(text), 1), ord("."), dtype=np.uint8), text[:, -decimals:]])
+    return text
+
+
+def format_text_column(values:np.ndarray)->np.ndarray:
+    codes, categories = pd.factorize(values)
+    width = max(len(str(category).encode()) for category in categories)
+    table = np.zeros((len(categories), width), dtype=np.uint8)
+    for index, category in enumerate(categories):
+        encoded = str(category).encode()
+        table[index, :len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+    return table[codes]
+
+
+def format_csv_chunk(df:pd.DataFrame, decimals:dict)->bytes:
+    """
+    Vectorized csv formatting: every row is laid out in a fixed width byte matrix
+    and padding bytes are dropped in one pass, much faster than DataFrame.to_csv.
+    decimals: digits after the point per float column, integer columns are written without
+    """
+    blocks = []
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if values.dtype == object:
+            blocks.append(format_text_column(values))
+        elif np.issubdtype(values.dtype, np.integer):
+            blocks.append(format_number_column(values, 0))
+        else:
+            # Float columns keep at least one decimal like pandas writes them, e.g. 190.0
+            blocks.append(format_number_column(values, max(decimals.get(column, 1), 1)))
+        blocks.append(np.full((len(df), 1), ord(","), dtype=np.uint8))
+    blocks[-1] = np.full((len(df), 1), ord("\n"), dtype=np.uint8)
+    text = np.hstack(blocks).ravel()
+    return text[text != 0].tobytes()
+
+
+def generate_chunk_task(generator, task:tuple):
+    """
+    Generates one chunk from (n_rows, chunk seed, drift, first user id, as_csv), chunks only
+    depend on their own seed so they can be generated in any process and in any order
+    """
+    n_rows, chunk_seed, drift, first_user_id, as_csv = task
+    df = generator.generate_chunk(n_rows, np.random.default_rng(chunk_seed), drift=drift, first_user_id=first_user_id)
+    return format_csv_chunk(df, generator.decimals) if as_csv else df
+
+
+# Set once per worker process by init_worker, so the fitted models are not sent with every chunk
+worker_generator = None
+
+def init_worker(generator):
+    global worker_generator
+    worker_generator = generator
+
+
+def run_worker_task(task:tuple):
+    return generate_chunk_task(worker_generator, task)
+
+
+class SyntheticDataGenerator:
+    """
+    Learns the shape of base data and generates any number of rows chunk by chunk.
+    Per gender, features are sampled with a gaussian copula (empirical marginals + correlation
+    of normal scores) and Calories is computed from a least squares fit on Duration interactions
+    with bootstrapped residuals, so the Calories relationship to Duration/Heart_Rate/Body_Temp is kept
+    """
+    def __init__(self, base_file_path:str=os.path.join("CaloriesBurn.csv"), n_quantiles:int=1001, seed:int=42):
+        try:
+            logger.info(f"{'>>'*20} Synthetic Data Generator {'<<'*20}")
+            self.seed_sequence = np.random.SeedSequence(seed)
+            self.quantile_levels = np.linspace(0, 1, n_quantiles)
+            base_df = pd.read_csv(base_file_path)
+            self.columns = list(base_df.columns)
+            self.feature_columns = [column for column in self.columns
+                                    if column not in (USER_ID_COLUMN, GENDER_COLUMN, TARGET_COLUMN)]
+            self.next_user_id = int(base_df[USER_ID_COLUMN].max()) + 1 if USER_ID_COLUMN in base_df.columns else 1
+            self.feature_std = base_df[self.feature_columns].std().to_dict()
+            self.feature_range = {column: (float(base_df[column].min()), float(base_df[column].max()))
+                                  for column in self.feature_columns}
+            self.decimals = {column: SyntheticDataGenerator.count_decimals(base_df[column])
+                             for column in self.feature_columns + [TARGET_COLUMN]}
+            self.target_range = (float(base_df[TARGET_COLUMN].min()), float(base_df[TARGET_COLUMN].max()))
+            self.integer_columns = [column for column in self.feature_columns
+                                    if pd.api.types.is_integer_dtype(base_df[column])]
+
+            gender_share = base_df[GENDER_COLUMN].value_counts(normalize=True)
+            self.genders = list(gender_share.index)
+            self.gender_probabilities = gender_share.to_numpy()
+            self.models = {gender: self.fit_group(group_df) for gender, group_df in base_df.groupby(GENDER_COLUMN)}
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    @staticmethod
+    def count_decimals(series:pd.Series, max_decimals:int=3)->int:
+        """
+        Smallest number of decimals that represents every base value
+        """
+        values = series.to_numpy(dtype=float)
+        for decimals in range(max_decimals + 1):
+            if np.allclose(values, np.round(values, decimals)):
+                return decimals
+        return max_decimals
+
+    @staticmethod
+    def calories_design(features:np.ndarray, feature_columns:list)->np.ndarray:
+        """
+        Intercept, each term and each term multiplied by Duration
+        """
+        terms = features[:, [feature_columns.index(column) for column in CALORIES_TERMS]]
+        duration = terms[:, [0]]
+        return np.hstack([np.ones((len(features), 1)), terms, duration * terms])
+
+    def fit_group(self, group_df:pd.DataFrame)->dict:
+        """
+        Learns marginals, copula correlation and Calories model of one gender
+        """
+        try:
+            features = group_df[self.feature_columns].to_numpy(dtype=float)
+            # Normal scores of ranks give the copula correlation
+            ranks = group_df[self.feature_columns].rank(method="average").to_numpy()
+            normal_scores = norm.ppf(ranks / (len(group_df) + 1))
+            correlation = np.corrcoef(normal_scores, rowvar=False)
+
+            design = SyntheticDataGenerator.calories_design(features, self.feature_columns)
+            target = group_df[TARGET_COLUMN].to_numpy(dtype=float)
+            coefficients, *_ = np.linalg.lstsq(design, target, rcond=None)
+            residuals = target - design @ coefficients
+
+            return {"quantiles": np.quantile(features, self.quantile_levels, axis=0),
+                    "cholesky": np.linalg.cholesky(correlation + 1e-9 * np.eye(len(correlation))),
+                    "coefficients": coefficients,
+                    "residuals": residuals}
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def sample_group(self, model:dict, n_rows:int, rng:np.random.Generator, drift:dict)->np.ndarray:
+        uniforms = norm.cdf(rng.standard_normal((n_rows, len(self.feature_columns))) @ model["cholesky"].T)
+        features = np.empty_like(uniforms)
+        for index, column in enumerate(self.feature_columns):
+            # Quantile levels are evenly spaced, so the interpolation index is computed directly
+            position = uniforms[:, index] * (len(self.quantile_levels) - 1)
+            lower = np.minimum(position.astype(np.int64), len(self.quantile_levels) - 2)
+            quantiles = model["quantiles"][:, index]
+            features[:, index] = quantiles[lower] + (position - lower) * (quantiles[lower + 1] - quantiles[lower])
+            if column in drift:
+                # Drift is given in base standard deviations, base range is widened by the same shift
+                shift = drift[column] * self.feature_std[column]
+                low, high = self.feature_range[column]
+                features[:, index] = np.clip(features[:, index] + shift, max(low + min(shift, 0), 0), high + max(shift, 0))
+        return features
+
+    def validate_drift(self, drift:dict):
+        unknown_columns = sorted(set(drift or dict()) - set(self.feature_columns))
+        if len(unknown_columns) > 0:
+            raise Exception(f"Drift can not be applied to {unknown_columns}, "
+                            f"valid feature columns are {self.feature_columns}")
+
+    def generate_chunk(self, n_rows:int, rng:np.random.Generator, drift:dict=None, first_user_id:int=None)->pd.DataFrame:
+        """
+        Generates n_rows rows with base columns
+        =========================================================================================
+        drift : {column: mean shift in base standard deviations}, Calories follows shifted features
+        first_user_id : User_ID of the first row, by default ids continue from the previous chunk
+        """
+        try:
+            self.validate_drift(drift)
+            drift = drift or dict()
+            if first_user_id is None:
+                first_user_id = self.next_user_id
+                self.next_user_id += n_rows
+            gender_index = rng.choice(len(self.genders), size=n_rows, p=self.gender_probabilities)
+            features = np.empty((n_rows, len(self.feature_columns)))
+            calories = np.empty(n_rows)
+            for index, gender in enumerate(self.genders):
+                mask = gender_index == index
+                n_group = int(mask.sum())
+                if n_group == 0:
+                    continue
+                model = self.models[gender]
+                group_features = self.sample_group(model, n_group, rng, drift)
+                group_features = np.column_stack([np.round(group_features[:, i], self.decimals[column])
+                                                  for i, column in enumerate(self.feature_columns)])
+                design = SyntheticDataGenerator.calories_design(group_features, self.feature_columns)
+                noise = model["residuals"][rng.integers(0, len(model["residuals"]), size=n_group)]
+                features[mask] = group_features
+                calories[mask] = design @ model["coefficients"] + noise
+
+            low, high = self.target_range
+            calories = np.round(np.clip(calories, low, None if drift else high), self.decimals[TARGET_COLUMN])
+
+            data = {USER_ID_COLUMN: np.arange(first_user_id, first_user_id + n_rows),
+                    GENDER_COLUMN: np.asarray(self.genders, dtype=object)[gender_index]}
+            for index, column in enumerate(self.feature_columns):
+                data[column] = features[:, index].astype(np.int64) if column in self.integer_columns else features[:, index]
+            data[TARGET_COLUMN] = calories
+            return pd.DataFrame(data)[self.columns]
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def generate(self, n_rows:int, chunk_size:int=1_000_000, drift:dict=None, workers:int=1, as_csv:bool=False):
+        """
+        Yields dataframes (or formatted csv bytes when as_csv) of at most chunk_size rows in chunk order.
+        With workers > 1 chunks are generated in a process pool, at most two chunks per worker
+        are in flight so memory stays bounded. Output does not depend on the number of workers
+        """
+        self.validate_drift(drift)
+        chunk_seeds = self.seed_sequence.spawn((n_rows + chunk_size - 1) // chunk_size)
+        tasks = [(min(chunk_size, n_rows - chunk_number * chunk_size), chunk_seed, drift,
+                  self.next_user_id + chunk_number * chunk_size, as_csv)
+                 for chunk_number, chunk_seed in enumerate(chunk_seeds)]
+        self.next_user_id += n_rows
+        if workers <= 1:
+            for task in tasks:
+                yield generate_chunk_task(self, task)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            for task in tasks:
+                pending.append(executor.submit(run_worker_task, task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while len(pending) > 0:
+                yield pending.popleft().result()
+
+    def to_csv(self, file_path:str, n_rows:int, chunk_size:int=1_000_000, drift:dict=None, workers:int=1):
+        """
+        Writes csv with the same columns as base file, chunks are formatted with format_csv_chunk
+        inside the workers and written in order
+        """
+        try:
+            self.validate_drift(drift)
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with open(file_path, "wb") as file_writer:
+                file_writer.write((",".join(self.columns) + "\n").encode())
+                for chunk_number, text in enumerate(self.generate(n_rows, chunk_size, drift, workers, as_csv=True)):
+                    file_writer.write(text)
+                    logger.info(f"Written chunk {chunk_number} ({len(text)} bytes) to {file_path}")
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def to_parquet(self, file_path:str, n_rows:int, chunk_size:int=1_000_000, drift:dict=None, workers:int=1):
+        """
+        Writes one parquet row group per chunk
+        """
+        try:
+            if pa is None:
+                raise Exception("pyarrow is required to write parquet files")
+            self.validate_drift(drift)
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            parquet_writer = None
+            try:
+                for chunk_number, df in enumerate(self.generate(n_rows, chunk_size, drift, workers)):
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(file_path, table.schema)
+                    parquet_writer.write_table(table)
+                    logger.info(f"Written chunk {chunk_number} with {len(df)} rows to {file_path}")
+            finally:
+                if parquet_writer is not None:
+                    parquet_writer.close()
+        except Exception as e:
+            raise CalorieException(e, sys)
+
+    def to_mongo(self, database_name:str, collection_name:str, n_rows:int, chunk_size:int=100_000,
+                 drift:dict=None, client=None, workers:int=1):
+        """
+        Inserts rows in bulk, client can be a local stand-in such as mongomock.MongoClient
+        """
+        try:
+            self.validate_drift(drift)
+            data_access = MongoDataAccess(client=client)
+            for chunk_number, df in enumerate(self.generate(n_rows, chunk_size, drift, workers)):
+                inserted = data_access.insert_many(database_name, collection_name, df.to_dict(orient="records"))
+                logger.info(f"Inserted chunk {chunk_number} with {inserted} rows to {database_name}.{collection_name}")
+        except Exception as e:
+            raise CalorieException(e, sys)
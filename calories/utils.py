@@ -1,11 +1,23 @@
 import yaml
+import json
 import dill    # To store python object as a file like pkl
 import os,sys
 import numpy as np
 import pandas as pd
 from calories.logger import logger
 from calories.exception import CalorieException
-from calories.config import mongo_client
+from calories.data_access import MongoDataAccess
+
+try:
+    # libyaml bindings, same output as pure python dumper/loader but much faster
+    from yaml import CDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import Dumper as YamlDumper, SafeLoader as YamlLoader
+
+try:
+    import orjson
+except ImportError:     # orjson is optional, standard json is used otherwise
+    orjson = None
 
 def get_collection_as_dataframe(database_name:str,collection_name:str)->pd.DataFrame:
     """
@@ -19,7 +31,7 @@ def get_collection_as_dataframe(database_name:str,collection_name:str)->pd.DataF
     """
     try:    
         logger.info(f"Reading data from database: {database_name} and collection: {collection_name}")
-        df = pd.DataFrame(list(mongo_client[database_name][collection_name].find()))
+        df = MongoDataAccess().get_collection_as_dataframe(database_name=database_name, collection_name=collection_name)
         logger.info(f"Found columns: {df.columns}")
         if "_id" in df.columns:
             logger.info(f"Dropping column: _id ")
@@ -37,7 +49,50 @@ def write_yaml_file(file_path,data:dict):
         file_dir = os.path.dirname(file_path)
         os.makedirs(file_dir,exist_ok=True)
         with open(file_path,"w") as file_writer:
-            yaml.dump(data,file_writer)
+            yaml.dump(data,file_writer,Dumper=YamlDumper)
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+def read_yaml_file(file_path)->dict:
+    """
+    Reading yaml report
+    """
+    try:
+        with open(file_path,"r") as file_reader:
+            return yaml.load(file_reader,Loader=YamlLoader)
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+def dump_json(data)->bytes:
+    """
+    Compact json encoding of data, numpy values are converted to python values
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY|orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",",":"), default=lambda value: value.item() if hasattr(value,"item") else str(value)).encode()
+
+def write_json_file(file_path,data:dict):
+    """
+    Creating compact machine readable json report
+    """
+    try:
+        file_dir = os.path.dirname(file_path)
+        os.makedirs(file_dir,exist_ok=True)
+        with open(file_path,"wb") as file_writer:
+            file_writer.write(dump_json(data))
+    except Exception as e:
+        raise CalorieException(e, sys)
+
+def load_json(content:bytes):
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+def read_json_file(file_path)->dict:
+    """
+    Reading json report
+    """
+    try:
+        with open(file_path,"rb") as file_reader:
+            return load_json(file_reader.read())
     except Exception as e:
         raise CalorieException(e, sys)
     
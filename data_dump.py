@@ -2,7 +2,7 @@ import pymongo
 import pandas as pd
 import json
 
-from calories.config import mongo_client
+from calories.data_access import MongoDataAccess
 
 # from sensor.config import mongo_client
 
@@ -20,5 +20,5 @@ if __name__=="__main__":
     json_record = list(json.loads(df.T.to_json()).values())
     print(json_record[0])
     # #insert converted json record to mongo db
-    mongo_client[DATABASE_NAME][COLLECTION_NAME].insert_many(json_record)
-    print("Data dumped successfully")
\ No newline at end of file
+    inserted = MongoDataAccess().insert_many(DATABASE_NAME, COLLECTION_NAME, json_record)
+    print(f"Data dumped successfully: {inserted} records")
\ No newline at end of file
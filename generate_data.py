@@ -0,0 +1,52 @@
+import os
+import argparse
+
+from calories.synthetic_data import SyntheticDataGenerator
+
+# Generates synthetic rows shaped like CaloriesBurn.csv to load test the pipeline
+
+DATABASE_NAME="calories_burn"
+COLLECTION_NAME="calories"
+# Rows per chunk by output, every mongo chunk is converted to dicts and sent in one insert_many
+FILE_CHUNK_SIZE=1_000_000
+MONGO_CHUNK_SIZE=100_000
+
+def parse_drift(values):
+    """
+    Converts ["Heart_Rate=0.5", "Age=-1"] to {"Heart_Rate": 0.5, "Age": -1.0}
+    """
+    drift = dict()
+    for value in values or []:
+        column, shift = value.split("=")
+        drift[column] = float(shift)
+    return drift
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic calories burn data")
+    parser.add_argument("--rows", type=int, required=True, help="Number of rows to generate")
+    parser.add_argument("--output", choices=["csv","parquet","mongo"], default="csv")
+    parser.add_argument("--file-path", default="synthetic_data/calories.csv", help="Output file for csv and parquet")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help=f"Rows per chunk, defaults to {FILE_CHUNK_SIZE} for files and {MONGO_CHUNK_SIZE} for mongo")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes generating chunks, output is the same for any number of workers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drift", nargs="*", help="Mean shift in base standard deviations, e.g. Heart_Rate=0.5")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    chunk_size = args.chunk_size or (MONGO_CHUNK_SIZE if args.output == "mongo" else FILE_CHUNK_SIZE)
+
+    generator = SyntheticDataGenerator(seed=args.seed)
+    drift = parse_drift(args.drift)
+    unknown_columns = sorted(set(drift) - set(generator.feature_columns))
+    if len(unknown_columns) > 0:
+        parser.error(f"--drift got unknown columns {unknown_columns}, valid feature columns are {generator.feature_columns}")
+    if args.output == "csv":
+        generator.to_csv(args.file_path, args.rows, chunk_size=chunk_size, drift=drift, workers=args.workers)
+    elif args.output == "parquet":
+        generator.to_parquet(args.file_path, args.rows, chunk_size=chunk_size, drift=drift, workers=args.workers)
+    else:
+        generator.to_mongo(DATABASE_NAME, COLLECTION_NAME, args.rows, chunk_size=chunk_size, drift=drift, workers=args.workers)
+    print(f"Generated {args.rows} rows")
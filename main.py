@@ -2,6 +2,7 @@ from calories.entity import config_entity
 from calories.components.data_ingestion import DataIngestion
 from calories.components.data_validation import DataValidation
 from calories.components.data_transformation import DataTransformation
+from calories.components.artifact_manager import ArtifactManager
 
 def main():
     training_pipeline_config = config_entity.TrainingPipelineConfig()
@@ -25,5 +26,10 @@ def main():
     data_validation_artifact=data_validation_artifact)
     data_transformation_artifact = data_transformation.initiate_data_transformation()
 
+    #artifact manager
+    artifact_manager_config = config_entity.ArtifactManagerConfig(training_pipeline_config=training_pipeline_config)
+    artifact_manager = ArtifactManager(artifact_manager_config=artifact_manager_config)
+    artifact_manager_artifact = artifact_manager.initiate_artifact_manager()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file